@@ -86,6 +86,12 @@ DATABASES = {
         "NAME": os.environ.get("DB_NAME"),
         "USER": os.environ.get("DB_USER"),
         "PASSWORD": os.environ.get("DB_PASS"),
+        "PORT": os.environ.get("DB_PORT", ""),
+        "CONN_MAX_AGE": int(os.environ.get("DB_CONN_MAX_AGE", 60)),
+        # Server-side cursors do not survive PgBouncer transaction pooling.
+        "DISABLE_SERVER_SIDE_CURSORS": bool(
+            int(os.environ.get("DB_POOLED", 0))
+        ),
     }
 }
 
@@ -140,4 +146,8 @@ AUTH_USER_MODEL = 'core.User'
 
 REST_FRAMEWORK = {
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
+    'DEFAULT_RENDERER_CLASSES': [
+        'core.renderers.ORJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
 }
@@ -0,0 +1,33 @@
+"""
+Django settings used when running the test suite.
+"""
+import os
+
+from app.settings import *  # noqa: F401,F403
+
+# Password hashing strength is irrelevant in tests and PBKDF2 dominates
+# the cost of every create_user() call.
+PASSWORD_HASHERS = [
+    'django.contrib.auth.hashers.MD5PasswordHasher',
+]
+
+# Commits in tests do not need to survive a crash, so don't wait for the
+# WAL flush on every one of them.
+DATABASES['default']['OPTIONS'] = {  # noqa: F405
+    'options': '-c synchronous_commit=off',
+}
+
+# No test relies on serialized_rollback, so skip dumping the freshly
+# migrated test database to JSON at the start of every run.
+DATABASES['default']['TEST'] = {'SERIALIZE': False}  # noqa: F405
+
+# Opt-in in-memory SQLite for a quick local loop without Postgres. CI
+# keeps running against Postgres.
+if bool(int(os.environ.get('DB_TEST_SQLITE', 0))):
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': ':memory:',
+            'TEST': {'SERIALIZE': False},
+        }
+    }
@@ -45,6 +45,13 @@ class UserAdmin(BaseUserAdmin):
     )
 
 
+class RecipeAdmin(admin.ModelAdmin):
+    """ define the admin pages for recipes. """
+    ordering = ['id']
+    list_display = ['title', 'user', 'time_minutes', 'price']
+    list_select_related = ['user']
+
+
 admin.site.register(models.User, UserAdmin)
-admin.site.register(models.Recipe)
+admin.site.register(models.Recipe, RecipeAdmin)
 admin.site.register(models.Tag)
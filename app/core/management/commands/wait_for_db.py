@@ -4,9 +4,13 @@ Django command to wait for the database to be available.
 import time
 from psycopg2 import OperationalError as Psycopg2OpError
 
-from django.core.management.base import BaseCommand
+from django.core.management.base import BaseCommand, CommandError
 from django.db.utils import OperationalError
 
+INITIAL_DELAY = 0.1
+MAX_DELAY = 5.0
+TIMEOUT = 60
+
 
 class Command(BaseCommand):
     """Django command to wait for db."""
@@ -15,12 +19,24 @@ class Command(BaseCommand):
         """ Entrypoint for command. """
 
         self.stdout.write('waiting for database...')
-        db_up = False
-        while db_up is False:
+        delay = INITIAL_DELAY
+        deadline = time.monotonic() + TIMEOUT
+        while True:
             try:
                 self.check(databases=['default'])
-                db_up = True
+                break
             except (Psycopg2OpError, OperationalError):
-                self.stdout.write('Database unavailable, waiting 1 sec...')
-                time.sleep(1)
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise CommandError(
+                        f'Database unavailable after {TIMEOUT} seconds.'
+                    )
+                # Never sleep past the deadline, so the last attempt is
+                # made right at it.
+                wait = min(delay, remaining)
+                self.stdout.write(
+                    f'Database unavailable, waiting {wait:g} sec...'
+                )
+                time.sleep(wait)
+                delay = min(delay * 2, MAX_DELAY)
         self.stdout.write(self.style.SUCCESS('Database available!'))
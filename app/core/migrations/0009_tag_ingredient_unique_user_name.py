@@ -0,0 +1,70 @@
+# Generated by Django 3.2.25 on 2026-10-14 17:06
+
+from django.db import migrations, models
+from django.db.models import Count, Min
+
+
+def merge_duplicates(apps, model_name, relation):
+    """Keep one row per (user, name), moving recipe links onto it."""
+    model = apps.get_model('core', model_name)
+    field = apps.get_model('core', 'Recipe')._meta.get_field(relation)
+    through = field.remote_field.through
+    target = f'{field.m2m_reverse_field_name()}_id'
+
+    duplicates = model.objects.filter(
+        name__isnull=False,
+    ).values('user_id', 'name').annotate(
+        keep_id=Min('id'),
+        count=Count('id'),
+    ).filter(count__gt=1)
+
+    for group in duplicates:
+        keep_id = group['keep_id']
+        other_ids = list(model.objects.filter(
+            user_id=group['user_id'],
+            name=group['name'],
+        ).exclude(id=keep_id).values_list('id', flat=True))
+
+        linked = set(through.objects.filter(
+            **{target: keep_id},
+        ).values_list('recipe_id', flat=True))
+        moved = set(through.objects.filter(
+            **{f'{target}__in': other_ids},
+        ).values_list('recipe_id', flat=True)) - linked
+        through.objects.bulk_create([
+            through(recipe_id=recipe_id, **{target: keep_id})
+            for recipe_id in moved
+        ])
+
+        model.objects.filter(id__in=other_ids).delete()
+
+
+def merge_duplicate_names(apps, schema_editor):
+    merge_duplicates(apps, 'Tag', 'tags')
+    merge_duplicates(apps, 'Ingredient', 'ingredients')
+
+
+class Migration(migrations.Migration):
+    # Commit the merge before adding the constraints: PostgreSQL refuses to
+    # ALTER a table with pending deferred FK checks from the deletes.
+    atomic = False
+
+    dependencies = [
+        ('core', '0008_recipe_image'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            merge_duplicate_names,
+            migrations.RunPython.noop,
+            atomic=True,
+        ),
+        migrations.AddConstraint(
+            model_name='ingredient',
+            constraint=models.UniqueConstraint(fields=('user', 'name'), name='uniq_ingredient_user_name'),
+        ),
+        migrations.AddConstraint(
+            model_name='tag',
+            constraint=models.UniqueConstraint(fields=('user', 'name'), name='uniq_tag_user_name'),
+        ),
+    ]
@@ -82,6 +82,14 @@ class Tag(models.Model):
         on_delete=models.CASCADE
         )
 
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['user', 'name'],
+                name='uniq_tag_user_name',
+            ),
+        ]
+
     def __str__(self):
         return self.name
 
@@ -94,5 +102,13 @@ class Ingredient(models.Model):
         on_delete=models.CASCADE
         )
 
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['user', 'name'],
+                name='uniq_ingredient_user_name',
+            ),
+        ]
+
     def __str__(self):
         return self.name
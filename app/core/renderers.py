@@ -0,0 +1,26 @@
+"""
+Custom renderers for the API.
+"""
+import orjson
+
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+
+class ORJSONRenderer(JSONRenderer):
+    """Render JSON responses with orjson."""
+
+    # Types orjson does not handle natively (lazy strings, querysets...).
+    _default = staticmethod(JSONEncoder().default)
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        """Render `data` into JSON bytes."""
+        if data is None:
+            return b''
+
+        option = orjson.OPT_NON_STR_KEYS
+        # orjson only offers one indent width; any requested indent gets it.
+        if self.get_indent(accepted_media_type, renderer_context or {}):
+            option |= orjson.OPT_INDENT_2
+
+        return orjson.dumps(data, default=self._default, option=option)
@@ -1,27 +1,38 @@
 """ test for the django admin modifications. """
+from decimal import Decimal
 
 from django.contrib.auth import get_user_model
+from django.db import connection
 from django.urls import reverse
 from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext
+
+from core.models import Recipe
+
+User = get_user_model()
 
 
 class AdminSiteTests(TestCase):
     """ Tests for the django admin. """
 
-    def setUp(self):
-        """Create user and client. """
-        self.client = Client()
-        self.admin_user = get_user_model().objects.create_superuser(
+    @classmethod
+    def setUpTestData(cls):
+        """Create users once for the whole test case. """
+        cls.admin_user = User.objects.create_superuser(
             email='admin@example.com',
             password='test123',
         )
-        self.client.force_login(self.admin_user)
-        self.user = get_user_model().objects.create_user(
+        cls.user = User.objects.create_user(
             email='user@example.com',
             password='test1234',
             name='Test User'
         )
 
+    def setUp(self):
+        """Create a logged in client. """
+        self.client = Client()
+        self.client.force_login(self.admin_user)
+
     def test_users_list(self):
         """ Test that users are listed on page. """
         url = reverse('admin:core_user_changelist')
@@ -36,3 +47,39 @@ class AdminSiteTests(TestCase):
         res = self.client.get(url)
 
         self.assertEqual(res.status_code, 200)
+
+    def test_recipes_list(self):
+        """ Test that recipes are listed on page. """
+        for i in range(3):
+            Recipe.objects.create(
+                user=self.user,
+                title=f'Recipe {i}',
+                time_minutes=5,
+                price=Decimal('5.50'),
+            )
+        url = reverse('admin:core_recipe_changelist')
+        res = self.client.get(url)
+
+        self.assertContains(res, 'Recipe 2')
+        self.assertContains(res, self.user.email)
+
+    def test_recipes_list_queries_independent_of_size(self):
+        """ Test the recipe list does not query the user per row. """
+        url = reverse('admin:core_recipe_changelist')
+        counts = []
+        for n in (1, 3):
+            Recipe.objects.all().delete()
+            for i in range(n):
+                Recipe.objects.create(
+                    user=User.objects.create_user(
+                        email=f'user{n}-{i}@example.com',
+                    ),
+                    title=f'Recipe {i}',
+                    time_minutes=5,
+                    price=Decimal('5.50'),
+                )
+            with CaptureQueriesContext(connection) as queries:
+                self.client.get(url)
+            counts.append(len(queries))
+
+        self.assertEqual(counts[0], counts[1])
@@ -5,7 +5,7 @@ from unittest.mock import patch
 
 from psycopg2 import OperationalError as Psycopg2Error
 
-from django.core.management import call_command
+from django.core.management import call_command, CommandError
 from django.db.utils import OperationalError
 from django.test import SimpleTestCase
 
@@ -32,3 +32,38 @@ class CommandTests(SimpleTestCase):
 
         self.assertEqual(pathced_check.call_count, 6)
         pathced_check.assert_called_with(databases=['default'])
+
+    @patch('time.sleep')
+    def test_wait_for_db_backoff(self, patched_sleep, patched_check):
+        """ Test the delay between attempts doubles up to a cap. """
+        patched_check.side_effect = [OperationalError] * 8 + [True]
+
+        call_command('wait_for_db')
+
+        delays = [c.args[0] for c in patched_sleep.call_args_list]
+        self.assertEqual(delays, [0.1, 0.2, 0.4, 0.8, 1.6, 3.2, 5.0, 5.0])
+
+    @patch('time.monotonic', side_effect=[0, 0, 59.875, 60])
+    @patch('time.sleep')
+    def test_wait_for_db_timeout(self, patched_sleep, patched_monotonic,
+                                 patched_check):
+        """ Test the command gives up after a last attempt at the timeout. """
+        patched_check.side_effect = OperationalError
+
+        with self.assertRaises(CommandError):
+            call_command('wait_for_db')
+
+        delays = [c.args[0] for c in patched_sleep.call_args_list]
+        self.assertEqual(delays, [0.1, 0.125])
+        self.assertEqual(patched_check.call_count, 3)
+
+    @patch('time.monotonic', side_effect=[0, 0, 59.875])
+    @patch('time.sleep')
+    def test_wait_for_db_ready_at_timeout(self, patched_sleep,
+                                          patched_monotonic, patched_check):
+        """ Test a database coming up during the last wait is accepted. """
+        patched_check.side_effect = [OperationalError] * 2 + [True]
+
+        call_command('wait_for_db')
+
+        self.assertEqual(patched_check.call_count, 3)
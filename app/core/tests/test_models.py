@@ -4,15 +4,18 @@ Tests for models.
 from unittest.mock import patch
 
 from decimal import Decimal
+from django.db import IntegrityError
 from django.test import TestCase
 from django.contrib.auth import get_user_model
 
 from core import models
 
+User = get_user_model()
+
 
 def create_user(email='email@domain.com', password='pass1234'):
     """Creates a user"""
-    return get_user_model().objects.create_user(email=email, password=password)
+    return User.objects.create_user(email=email, password=password)
 
 
 class ModelTests(TestCase):
@@ -22,7 +25,7 @@ class ModelTests(TestCase):
         """ Test creating a user with email. """
         email = 'test@email.com'
         password = 'testpass123'
-        user = get_user_model().objects.create_user(
+        user = User.objects.create_user(
             email=email,
             password=password
         )
@@ -37,19 +40,20 @@ class ModelTests(TestCase):
             ['Test2@EXAMPLE.com', 'Test2@example.com'],
             ['TEST3@Example.com', 'TEST3@example.com'],
             ['test4@Example.COM', 'test4@example.com'],
+            [' test5@Example.COM ', 'test5@example.com'],
         ]
         for email, expected in sample_emails:
-            user = get_user_model().objects.create_user(email, 'sample123')
+            user = User.objects.create_user(email, 'sample123')
             self.assertEqual(user.email, expected)
 
     def test_user_creation_without_email(self):
         """ testing the creation of a new user without email. """
         with self.assertRaises(ValueError):
-            get_user_model().objects.create_user('', 'test123')
+            User.objects.create_user('', 'test123')
 
     def test_create_superuser(self):
         """test for creating a superuser."""
-        user = get_user_model().objects.create_superuser(
+        user = User.objects.create_superuser(
             'test@email.com',
             'test123'
         )
@@ -58,7 +62,7 @@ class ModelTests(TestCase):
 
     def test_create_recpe(self):
         """Test creating a recipe is successful."""
-        user = get_user_model().objects.create_user(
+        user = User.objects.create_user(
             'email@gmail.com',
             'password123'
         )
@@ -71,6 +75,18 @@ class ModelTests(TestCase):
         )
         self.assertEqual(str(recipe), recipe.title)
 
+    def test_recipe_str_follows_title(self):
+        """Test the recipe string is not stale after changing the title."""
+        recipe = models.Recipe.objects.create(
+            user=create_user(),
+            title='recipe title',
+            time_minutes=5,
+            price=Decimal('5.50'),
+        )
+        recipe.title = 'new recipe title'
+
+        self.assertEqual(str(recipe), 'new recipe title')
+
     def test_create_tag(self):
         """Test the creation of a recipe."""
         user = create_user()
@@ -89,6 +105,22 @@ class ModelTests(TestCase):
         )
         self.assertEqual(str(ingredient), ingredient.name)
 
+    def test_tag_name_unique_per_user(self):
+        """Test a user cannot have two tags with the same name."""
+        user = create_user()
+        models.Tag.objects.create(user=user, name='Tag1')
+
+        with self.assertRaises(IntegrityError):
+            models.Tag.objects.create(user=user, name='Tag1')
+
+    def test_ingredient_name_unique_per_user(self):
+        """Test a user cannot have two ingredients with the same name."""
+        user = create_user()
+        models.Ingredient.objects.create(user=user, name='Ingredient')
+
+        with self.assertRaises(IntegrityError):
+            models.Ingredient.objects.create(user=user, name='Ingredient')
+
     @patch('core.models.uuid.uuid4')
     def test_recipe_file_name_uuid(self, mock_uuid):
         """Test generating unique image path."""
@@ -0,0 +1,51 @@
+"""
+Tests for the custom renderers.
+"""
+from decimal import Decimal
+
+from django.test import SimpleTestCase
+from django.utils.translation import gettext_lazy as _
+
+from core.renderers import ORJSONRenderer
+
+
+class ORJSONRendererTests(SimpleTestCase):
+    """Test the orjson renderer."""
+
+    def test_render_data(self):
+        """Test rendering nested data including non-native types."""
+        data = {
+            'title': 'Sample',
+            'price': Decimal('5.25'),
+            'tags': [{'id': 1, 'name': _('Vegan')}],
+        }
+
+        res = ORJSONRenderer().render(data)
+
+        self.assertEqual(
+            res,
+            b'{"title":"Sample","price":5.25,'
+            b'"tags":[{"id":1,"name":"Vegan"}]}',
+        )
+
+    def test_render_none(self):
+        """Test rendering no data returns an empty body."""
+        self.assertEqual(ORJSONRenderer().render(None), b'')
+
+    def test_render_non_str_keys(self):
+        """Test rendering dicts with non-string keys."""
+        self.assertEqual(ORJSONRenderer().render({1: 'x'}), b'{"1":"x"}')
+
+    def test_render_indent(self):
+        """Test rendering honours a requested indent."""
+        renderer = ORJSONRenderer()
+        expected = b'{\n  "id": 1\n}'
+
+        self.assertEqual(
+            renderer.render({'id': 1}, 'application/json; indent=4'),
+            expected,
+        )
+        self.assertEqual(
+            renderer.render({'id': 1}, renderer_context={'indent': 4}),
+            expected,
+        )
@@ -1,6 +1,12 @@
 """
 Recipe serializers
 """
+from collections import OrderedDict
+from copy import copy
+from operator import attrgetter
+
+from django.utils.functional import cached_property
+from django.utils.translation import gettext as _
 
 from core.models import (
     Recipe,
@@ -8,9 +14,58 @@ from core.models import (
     Ingredient
     )
 from rest_framework import serializers
+from rest_framework.fields import SkipField
+from rest_framework.relations import PKOnlyObject
+
+
+class CachedFieldsModelSerializer(serializers.ModelSerializer):
+    """Model serializer introspecting its fields once per class."""
+    _fields_cache = {}
+
+    def get_fields(self):
+        """Return shallow copies of the fields built for this class."""
+        cls = type(self)
+        if cls not in self._fields_cache:
+            self._fields_cache[cls] = super().get_fields()
+
+        fields = OrderedDict()
+        for field_name, field in self._fields_cache[cls].items():
+            field = copy(field)
+            if isinstance(field, serializers.ListSerializer):
+                # Nested serializers must not share their child, or the
+                # child would resolve root and context through another
+                # serializer instance.
+                field.child = copy(field.child)
+                field.child.parent = field
+            fields[field_name] = field
+
+        return fields
+
+
+class RecipeAttrSerializer(CachedFieldsModelSerializer):
+    """Base serializer for recipe attributes named uniquely per user."""
+
+    def validate_name(self, value):
+        """Reject renaming to a name the user already uses."""
+        # Nested under a recipe, names are looked up or created instead.
+        if self.parent is not None:
+            return value
+
+        existing = self.Meta.model.objects.filter(
+            user=self.context['request'].user,
+            name=value,
+        )
+        if self.instance is not None:
+            existing = existing.exclude(pk=self.instance.pk)
+        if existing.exists():
+            raise serializers.ValidationError(
+                _('You already have one with this name.'),
+            )
+
+        return value
 
 
-class IngredientSerializer(serializers.ModelSerializer):
+class IngredientSerializer(RecipeAttrSerializer):
     """Ingredient serializer."""
 
     class Meta:
@@ -19,7 +74,7 @@ class IngredientSerializer(serializers.ModelSerializer):
         read_only_fields = ['id']
 
 
-class TagSerializer(serializers.ModelSerializer):
+class TagSerializer(RecipeAttrSerializer):
     """Tag model serializer."""
 
     class Meta:
@@ -28,7 +83,7 @@ class TagSerializer(serializers.ModelSerializer):
         read_only_fields = ['id']
 
 
-class RecipeSerializer(serializers.ModelSerializer):
+class RecipeSerializer(CachedFieldsModelSerializer):
     """recipe model serializer."""
     tags = TagSerializer(many=True, required=False)
     ingredients = IngredientSerializer(many=True, required=False)
@@ -41,6 +96,54 @@ class RecipeSerializer(serializers.ModelSerializer):
             ]
         read_only_fields = ['id']
 
+    @cached_property
+    def _representation_plan(self):
+        """Precomputed (name, getter, to_representation) per readable field.
+
+        Fields sourced straight from a model field read it with a plain
+        attrgetter; anything else (method fields, `source='*'`, callable
+        or dotted sources) keeps DRF's `get_attribute`.
+        """
+        opts = Recipe._meta
+        model_fields = {
+            field.name for field in opts.concrete_fields + opts.many_to_many
+        }
+        return [
+            (
+                field.field_name,
+                attrgetter(field.source)
+                if field.source_attrs == [field.source]
+                and field.source in model_fields
+                else field.get_attribute,
+                field.to_representation,
+            )
+            for field in self._readable_fields
+        ]
+
+    def to_representation(self, instance):
+        """Serialize a recipe without per-field get_attribute dispatch."""
+        if not isinstance(instance, Recipe):
+            # Validated data and other non-model input need DRF's lookups.
+            return super().to_representation(instance)
+
+        ret = OrderedDict()
+        for name, getter, to_representation in self._representation_plan:
+            try:
+                attribute = getter(instance)
+            except SkipField:
+                continue
+
+            check_for_none = (
+                attribute.pk if isinstance(attribute, PKOnlyObject)
+                else attribute
+            )
+            ret[name] = (
+                None if check_for_none is None
+                else to_representation(attribute)
+            )
+
+        return ret
+
 
 class RecipeDetailSerializer(RecipeSerializer):
     """recipe detail model serializer."""
@@ -49,24 +152,40 @@ class RecipeDetailSerializer(RecipeSerializer):
         fields = RecipeSerializer.Meta.fields + ['description']
 
     def _get_or_create_tags(self, tags, recipe):
-        """Handle getting or creating tags as needed."""
+        """Handle getting or creating tags and assign them to the recipe."""
         auth_user = self.context['request'].user
-        for tag in tags:
-            tag_obj, created = Tag.objects.get_or_create(
-                user=auth_user,
-                **tag,
-            )
-            recipe.tags.add(tag_obj)
+        names = list(dict.fromkeys(tag['name'] for tag in tags))
+        existing = set(Tag.objects.filter(
+            user=auth_user,
+            name__in=names,
+        ).values_list('name', flat=True))
+        Tag.objects.bulk_create(
+            [Tag(user=auth_user, name=n) for n in names if n not in existing],
+            batch_size=1000,
+            ignore_conflicts=True,
+        )
+        recipe.tags.set(Tag.objects.filter(user=auth_user, name__in=names))
 
     def _get_or_create_ingredient(self, ingredients, recipe):
-        """Handle getting or creating ingredients as needed."""
+        """Handle getting or creating ingredients and assign them."""
         auth_user = self.context['request'].user
-        for ingredient in ingredients:
-            ingr_obj, created = Ingredient.objects.get_or_create(
-                user=auth_user,
-                **ingredient,
-            )
-            recipe.ingredients.add(ingr_obj)
+        names = list(dict.fromkeys(ingr['name'] for ingr in ingredients))
+        existing = set(Ingredient.objects.filter(
+            user=auth_user,
+            name__in=names,
+        ).values_list('name', flat=True))
+        Ingredient.objects.bulk_create(
+            [
+                Ingredient(user=auth_user, name=n)
+                for n in names if n not in existing
+            ],
+            batch_size=1000,
+            ignore_conflicts=True,
+        )
+        recipe.ingredients.set(Ingredient.objects.filter(
+            user=auth_user,
+            name__in=names,
+        ))
 
     def create(self, validated_data):
         """Create and return a recipe object."""
@@ -83,10 +202,8 @@ class RecipeDetailSerializer(RecipeSerializer):
         tags = validated_data.pop('tags', None)
         ingredients = validated_data.pop('ingredients', None)
         if tags is not None:
-            instance.tags.clear()
             self._get_or_create_tags(tags, instance)
         if ingredients is not None:
-            instance.ingredients.clear()
             self._get_or_create_ingredient(ingredients, instance)
 
         for attr, value in validated_data.items():
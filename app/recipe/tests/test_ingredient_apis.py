@@ -12,12 +12,15 @@ from rest_framework.test import APIClient
 from recipe.serializers import IngredientSerializer
 from .test_recipe_api import create_recipe
 
+User = get_user_model()
+
 INGREDIENTS_URL = reverse('recipe:ingredient-list')
+INGREDIENT_DETAIL_URL = reverse('recipe:ingredient-detail', args=['_id_'])
 
 
 def create_user(email='user@gmail.com', password='pass12343'):
     """Create a user instance."""
-    return get_user_model().objects.create_user(
+    return User.objects.create_user(
         email=email,
         password=password,
     )
@@ -30,14 +33,12 @@ def create_ingredient(user, name):
 
 def detail_ingredient(ingredient_id):
     """Returns the detial URL of an ingredient."""
-    return reverse('recipe:ingredient-detail', args=[ingredient_id])
+    return INGREDIENT_DETAIL_URL.replace('_id_', str(ingredient_id))
 
 
 class PublicIngredientAPITest(TestCase):
     """Public ingredient API tests."""
-
-    def setUp(self):
-        self.client = APIClient()
+    client_class = APIClient
 
     def test_auth_required(self):
         """Auth required testing."""
@@ -47,10 +48,13 @@ class PublicIngredientAPITest(TestCase):
 
 class PrivateIngredientAPITest(TestCase):
     """Private ingredient API tests."""
+    client_class = APIClient
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = create_user()
 
     def setUp(self):
-        self.client = APIClient()
-        self.user = create_user()
         self.client.force_authenticate(self.user)
 
     def test_retrieve_ingredients(self):
@@ -73,9 +77,11 @@ class PrivateIngredientAPITest(TestCase):
             email='other@mail.com',
             password='otherpass123',
         )
-        create_ingredient(user=other_user, name='ingredient 3')
-        create_ingredient(user=self.user, name='ingredient 1')
-        create_ingredient(user=self.user, name='ingredient 2')
+        Ingredient.objects.bulk_create([
+            Ingredient(user=other_user, name='ingredient 3'),
+            Ingredient(user=self.user, name='ingredient 1'),
+            Ingredient(user=self.user, name='ingredient 2'),
+        ])
 
         res = self.client.get(INGREDIENTS_URL)
 
@@ -104,6 +110,20 @@ class PrivateIngredientAPITest(TestCase):
         self.assertEqual(ingredient.name, payload['name'])
         self.assertEqual(ingredient.user, self.user)
 
+    def test_update_ingredient_duplicate_name_error(self):
+        """Test renaming an ingredient to a name already used fails."""
+        create_ingredient(user=self.user, name='Salt')
+        ingredient = create_ingredient(user=self.user, name='Pepper')
+
+        res = self.client.patch(
+            detail_ingredient(ingredient.id),
+            {'name': 'Salt'},
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        ingredient.refresh_from_db()
+        self.assertEqual(ingredient.name, 'Pepper')
+
     def test_delete_ingredient(self):
         """Test delete an ingredient object."""
         ingredient = create_ingredient(
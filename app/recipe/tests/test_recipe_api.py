@@ -3,58 +3,84 @@ Tests for recipe APIs.
 """
 from decimal import Decimal
 from PIL import Image
-import tempfile
+import io
 import os
+import shutil
+import tempfile
+from unittest.mock import patch
 
 from django.contrib.auth import get_user_model
-from django.test import TestCase
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 
-from rest_framework import status
+from rest_framework import serializers, status
+from rest_framework.pagination import LimitOffsetPagination
 from rest_framework.test import APIClient
 
 from core.models import Recipe, Tag, Ingredient
 
 from recipe.serializers import RecipeSerializer, RecipeDetailSerializer
+from recipe.views import RecipeViewSet
+
+User = get_user_model()
 
 RECIPE_URL = reverse('recipe:recipe-list')
+RECIPE_DETAIL_URL = reverse('recipe:recipe-detail', args=['_id_'])
+IMAGE_UPLOAD_URL = reverse('recipe:recipe-upload-image', args=['_id_'])
+
+SAMPLE_PRICE = Decimal('5.25')
+UPDATED_PRICE = Decimal('20.25')
+CURRY_PRICE = Decimal('2.50')
+
+RECIPE_DEFAULTS = {
+    'title': 'Sample recipe title',
+    'time_minutes': 22,
+    'price': SAMPLE_PRICE,
+    'description': 'Sample description',
+    'link': 'http://example.com/recipe.pdf',
+}
 
 
 def image_upload_url(recipe_id):
     """Create and return an image upload URL."""
-    return reverse('recipe:recipe-upload-image', args=[recipe_id])
+    return IMAGE_UPLOAD_URL.replace('_id_', str(recipe_id))
 
 
 def recipe_detail_url(recipe_id):
     """Detail recipe url."""
-    return reverse('recipe:recipe-detail', args=[recipe_id])
+    return RECIPE_DETAIL_URL.replace('_id_', str(recipe_id))
 
 
 def create_user(**params):
     """Creates a user."""
-    return get_user_model().objects.create_user(**params)
+    return User.objects.create_user(**params)
 
 
 def create_recipe(user, **params):
     """Create and return a sample recipe."""
-    defaults = {
-        'title': 'Sample recipe title',
-        'time_minutes': 22,
-        'price': Decimal('5.25'),
-        'description': 'Sample description',
-        'link': 'http://example.com/recipe.pdf',
-    }
+    defaults = RECIPE_DEFAULTS.copy()
     defaults.update(params)
 
     recipe = Recipe.objects.create(user=user, **defaults)
     return recipe
 
 
+def bulk_create_recipes(user, n, **params):
+    """Create `n` sample recipes in a single query."""
+    defaults = RECIPE_DEFAULTS.copy()
+    defaults.update(params)
+
+    return Recipe.objects.bulk_create(
+        [Recipe(user=user, **defaults) for _ in range(n)]
+    )
+
+
 class PublicRecipeAPITest(TestCase):
     """Test unauthenticated recipe APIs."""
-
-    def setUp(self):
-        self.client = APIClient()
+    client_class = APIClient
 
     def test_auth_required_recipe(self):
         """Test auth is required for recipe APIs."""
@@ -65,21 +91,24 @@ class PublicRecipeAPITest(TestCase):
 
 class PrivateRecipeAPITest(TestCase):
     """Test authenticated recipe APIs."""
+    client_class = APIClient
 
-    def setUp(self):
-        self.client = APIClient()
-        self.user = get_user_model().objects.create_user(
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
             'user@example.com',
             'testpass123',
         )
+
+    def setUp(self):
         self.client.force_authenticate(self.user)
 
     def test_retrieve_recipes(self):
         """Test retrieving a list of recipes."""
-        create_recipe(user=self.user)
-        create_recipe(user=self.user)
+        bulk_create_recipes(user=self.user, n=2)
 
-        res = self.client.get(RECIPE_URL)
+        with self.assertNumQueries(3):
+            res = self.client.get(RECIPE_URL)
 
         recipes = Recipe.objects.all().order_by('-id')
         serializer = RecipeSerializer(recipes, many=True)
@@ -87,27 +116,166 @@ class PrivateRecipeAPITest(TestCase):
         self.assertEqual(res.status_code, status.HTTP_200_OK)
         self.assertEqual(res.data, serializer.data)
 
+    def test_recipe_list_queries_independent_of_size(self):
+        """Test listing recipes does not query once per recipe."""
+        tags = [
+            Tag.objects.create(user=self.user, name=f'tag {i}')
+            for i in range(3)
+        ]
+        ingredients = [
+            Ingredient.objects.create(user=self.user, name=f'ingredient {i}')
+            for i in range(3)
+        ]
+        for i in range(10):
+            recipe = create_recipe(user=self.user, title=f'recipe {i}')
+            recipe.tags.add(*tags)
+            recipe.ingredients.add(*ingredients)
+
+        with self.assertNumQueries(3):
+            res = self.client.get(RECIPE_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(res.data), 10)
+        self.assertEqual(len(res.data[0]['tags']), 3)
+        self.assertEqual(len(res.data[0]['ingredients']), 3)
+
+    def test_recipe_list_empty_single_query(self):
+        """Test listing no recipes skips the tag and ingredient lookups."""
+        with self.assertNumQueries(1):
+            res = self.client.get(RECIPE_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data, [])
+
+    def test_recipe_list_paginated(self):
+        """Test listing recipes honours the pagination class."""
+        bulk_create_recipes(self.user, 3)
+        recipes = Recipe.objects.filter(user=self.user).order_by('-id')
+        serializer = RecipeSerializer(recipes[:1], many=True)
+
+        with patch.object(
+            RecipeViewSet, 'pagination_class', LimitOffsetPagination,
+        ):
+            res = self.client.get(RECIPE_URL, {'limit': 1})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['count'], 3)
+        self.assertEqual(res.data['results'], serializer.data)
+
+    def test_recipe_list_raw_rows_cover_serializer(self):
+        """Test every list serializer field can be read from raw rows."""
+        fields = RecipeSerializer().fields
+        columns, relations = RecipeViewSet()._raw_list_plan(fields)
+
+        self.assertEqual(set(columns) | set(relations), set(fields))
+
+    def test_recipe_list_non_column_field(self):
+        """Test listing falls back to the serializer for method fields."""
+        class SummaryRecipeSerializer(RecipeSerializer):
+            summary = serializers.SerializerMethodField()
+
+            class Meta(RecipeSerializer.Meta):
+                fields = RecipeSerializer.Meta.fields + ['summary']
+
+            def get_summary(self, recipe):
+                return f'{recipe.title} ({recipe.time_minutes} min)'
+
+        create_recipe(user=self.user, title='Curry')
+
+        with patch.object(
+            RecipeViewSet, 'get_serializer_class',
+            return_value=SummaryRecipeSerializer,
+        ):
+            res = self.client.get(RECIPE_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data[0]['summary'], 'Curry (22 min)')
+        self.assertEqual(res.data[0]['title'], 'Curry')
+
     def test_recipe_list_limited_to_user(self):
         """Test list of recipes limited to an authenticated user."""
-        other_user = get_user_model().objects.create_user(
+        other_user = User.objects.create_user(
             'other@example.com',
             'password1234'
         )
         create_recipe(user=other_user)
-        create_recipe(user=self.user)
+        recipe = create_recipe(user=self.user)
 
         res = self.client.get(RECIPE_URL)
 
-        recipes = Recipe.objects.filter(user=self.user)
-        serializer = RecipeSerializer(recipes, many=True)
-
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        self.assertEqual(res.data, serializer.data)
+        self.assertEqual([r['id'] for r in res.data], [recipe.id])
+
+    def test_recipe_serializer_representation(self):
+        """Test the recipe serializer output matches the field types."""
+        recipe = create_recipe(user=self.user)
+        tag = Tag.objects.create(user=self.user, name='Vegan')
+        recipe.tags.add(tag)
+
+        serializer = RecipeSerializer(recipe)
+
+        self.assertEqual(serializer.data, {
+            'id': recipe.id,
+            'title': 'Sample recipe title',
+            'time_minutes': 22,
+            'price': '5.25',
+            'description': 'Sample description',
+            'link': 'http://example.com/recipe.pdf',
+            'tags': [{'id': tag.id, 'name': 'Vegan'}],
+            'ingredients': [],
+        })
+
+    def test_recipe_serializer_non_column_fields(self):
+        """Test method fields and callable sources keep DRF's lookups."""
+        class SummaryRecipeSerializer(RecipeSerializer):
+            summary = serializers.SerializerMethodField()
+            label = serializers.CharField(source='__str__', read_only=True)
+
+            class Meta(RecipeSerializer.Meta):
+                fields = RecipeSerializer.Meta.fields + ['summary', 'label']
+
+            def get_summary(self, recipe):
+                return f'{recipe.title} ({recipe.time_minutes} min)'
+
+        recipe = create_recipe(user=self.user, title='Curry')
+
+        data = SummaryRecipeSerializer(recipe).data
+
+        self.assertEqual(data['summary'], 'Curry (22 min)')
+        self.assertEqual(data['label'], 'Curry')
+        self.assertEqual(data['title'], 'Curry')
+
+    def test_recipe_serializer_validated_data_representation(self):
+        """Test the recipe serializer renders validated, unsaved data."""
+        payload = {
+            'title': 'Sample recipe title',
+            'time_minutes': 22,
+            'price': '5.25',
+        }
+        serializer = RecipeSerializer(data=payload)
+
+        self.assertTrue(serializer.is_valid())
+        self.assertEqual(serializer.data, {
+            'title': 'Sample recipe title',
+            'time_minutes': 22,
+            'price': '5.25',
+        })
+
+    def test_recipe_serializer_fields_not_shared(self):
+        """Test cached serializer fields are bound per serializer."""
+        serializer = RecipeSerializer()
+        other_serializer = RecipeSerializer()
+
+        tags = serializer.fields['tags']
+        self.assertIsNot(tags, other_serializer.fields['tags'])
+        self.assertIsNot(tags.child, other_serializer.fields['tags'].child)
+        self.assertIs(tags.child.root, serializer)
 
     def test_recipe_detail_retrieve(self):
         """Test detail recipe limited to an authenticated user."""
         recipe = create_recipe(user=self.user)
-        res = self.client.get(recipe_detail_url(recipe.id))
+        with self.assertNumQueries(3):
+            res = self.client.get(recipe_detail_url(recipe.id))
 
         serializer = RecipeDetailSerializer(recipe)
         self.assertEqual(res.data, serializer.data)
@@ -117,7 +285,7 @@ class PrivateRecipeAPITest(TestCase):
         payload = {
             'title': 'Sample recipe title',
             'time_minutes': 22,
-            'price': Decimal('5.25'),
+            'price': SAMPLE_PRICE,
         }
         res = self.client.post(RECIPE_URL, payload)
         self.assertEqual(res.status_code, status.HTTP_201_CREATED)
@@ -142,17 +310,19 @@ class PrivateRecipeAPITest(TestCase):
         res = self.client.patch(url, payload)
 
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        recipe.refresh_from_db()
-        self.assertEqual(recipe.title, payload['title'])
-        self.assertEqual(recipe.link, original_link)
-        self.assertEqual(recipe.user, self.user)
+        row = Recipe.objects.values('title', 'link', 'user_id').get(
+            id=recipe.id,
+        )
+        self.assertEqual(row['title'], payload['title'])
+        self.assertEqual(row['link'], original_link)
+        self.assertEqual(row['user_id'], self.user.id)
 
     def test_full_update(self):
         """Test the full update of a recipe object."""
         payload = {
             'title': 'Sample recipe title update',
             'time_minutes': 50,
-            'price': Decimal('20.25'),
+            'price': UPDATED_PRICE,
             'description': 'Sample description update',
             'link': 'http://example.com/recipe_update.pdf',
         }
@@ -161,10 +331,10 @@ class PrivateRecipeAPITest(TestCase):
         res = self.client.put(url, payload)
 
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        recipe.refresh_from_db()
+        row = Recipe.objects.values(*payload, 'user_id').get(id=recipe.id)
         for k, v in payload.items():
-            self.assertEqual(getattr(recipe, k), v)
-        self.assertEqual(recipe.user, self.user)
+            self.assertEqual(row[k], v)
+        self.assertEqual(row['user_id'], self.user.id)
 
     def test_update_user_returns_error(self):
         """Test returns error when changing the user of a recipe."""
@@ -212,22 +382,39 @@ class PrivateRecipeAPITest(TestCase):
         payload = {
             'title': 'Thai Prawn Curry',
             'time_minutes': 30,
-            'price': Decimal('2.50'),
+            'price': CURRY_PRICE,
             'tags': [{'name': 'Thai'}, {'name': 'Dinner'}],
         }
         res = self.client.post(RECIPE_URL, payload, format='json')
 
         self.assertEqual(res.status_code, status.HTTP_201_CREATED)
-        recipes = Recipe.objects.filter(user=self.user)
-        self.assertEqual(recipes.count(), 1)
+        recipes = list(Recipe.objects.filter(user=self.user))
+        self.assertEqual(len(recipes), 1)
         recipe = recipes[0]
         self.assertEqual(recipe.tags.count(), 2)
-        for tag in payload['tags']:
-            exists = recipe.tags.filter(
-                user=self.user,
-                name=tag['name']
-            )
-            self.assertTrue(exists)
+        names = {tag['name'] for tag in payload['tags']}
+        self.assertEqual(
+            recipe.tags.filter(user=self.user, name__in=names).count(),
+            len(names),
+        )
+
+    def test_create_recipe_tag_queries_independent_of_count(self):
+        """Test creating tags for a recipe does not query once per tag."""
+        query_counts = []
+        for n in (1, 5):
+            payload = {
+                'title': f'Recipe with {n} tags',
+                'time_minutes': 30,
+                'price': CURRY_PRICE,
+                'tags': [{'name': f'tag {n}-{i}'} for i in range(n)],
+            }
+            with CaptureQueriesContext(connection) as queries:
+                res = self.client.post(RECIPE_URL, payload, format='json')
+
+            self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+            query_counts.append(len(queries))
+
+        self.assertEqual(query_counts[0], query_counts[1])
 
     def test_create_recipe_for_existing_tags(self):
         """Test creating a new recipe with existing tags."""
@@ -235,23 +422,22 @@ class PrivateRecipeAPITest(TestCase):
         payload = {
             'title': 'Thai Prawn Curry',
             'time_minutes': 30,
-            'price': Decimal('2.50'),
+            'price': CURRY_PRICE,
             'tags': [{'name': 'tag name'}, {'name': 'Dinner'}],
         }
         res = self.client.post(RECIPE_URL, payload, format='json')
 
         self.assertEqual(res.status_code, status.HTTP_201_CREATED)
-        recipes = Recipe.objects.filter(user=self.user)
-        self.assertEqual(recipes.count(), 1)
+        recipes = list(Recipe.objects.filter(user=self.user))
+        self.assertEqual(len(recipes), 1)
         recipe = recipes[0]
         self.assertEqual(recipe.tags.count(), 2)
         self.assertIn(tag, recipe.tags.all())
-        for tag in payload['tags']:
-            exists = recipe.tags.filter(
-                user=self.user,
-                name=tag['name']
-            )
-            self.assertTrue(exists)
+        names = {tag['name'] for tag in payload['tags']}
+        self.assertEqual(
+            recipe.tags.filter(user=self.user, name__in=names).count(),
+            len(names),
+        )
 
     def test_create_tag_for_recipe_on_update(self):
         """Test creating tags when updating a recipe object."""
@@ -263,8 +449,9 @@ class PrivateRecipeAPITest(TestCase):
         res = self.client.patch(url, payload, format='json')
 
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        new_tag = Tag.objects.get(name='lunch')
-        self.assertIn(new_tag, recipe.tags.all())
+        self.assertTrue(
+            recipe.tags.filter(user=self.user, name='lunch').exists()
+        )
 
     def test_update_recipe_assign_tag(self):
         """Test assigning an existing tag when updating a recipe."""
@@ -299,7 +486,7 @@ class PrivateRecipeAPITest(TestCase):
         payload = {
             'title': 'Thai Prawn Curry',
             'time_minutes': 30,
-            'price': Decimal('2.50'),
+            'price': CURRY_PRICE,
             'tags': [{'name': 'Thai'}, {'name': 'Dinner'}],
             'ingredients': [{'name': 'Ingredient'},
                             {'name': 'Not Ingredient'}],
@@ -307,16 +494,15 @@ class PrivateRecipeAPITest(TestCase):
         res = self.client.post(RECIPE_URL, payload, format='json')
 
         self.assertEqual(res.status_code, status.HTTP_201_CREATED)
-        recipes = Recipe.objects.filter(user=self.user)
-        self.assertEqual(recipes.count(), 1)
+        recipes = list(Recipe.objects.filter(user=self.user))
+        self.assertEqual(len(recipes), 1)
         recipe = recipes[0]
         self.assertEqual(recipe.ingredients.count(), 2)
-        for v in payload['ingredients']:
-            exists = recipe.ingredients.filter(
-                user=self.user,
-                name=v['name'],
-            )
-            self.assertTrue(exists)
+        names = {v['name'] for v in payload['ingredients']}
+        self.assertEqual(
+            recipe.ingredients.filter(user=self.user, name__in=names).count(),
+            len(names),
+        )
 
     def test_create_recipe_with_existing_ingredient(self):
         """Test creating a recipe with existing ingredients."""
@@ -325,7 +511,7 @@ class PrivateRecipeAPITest(TestCase):
         payload = {
             'title': 'Thai Prawn Curry',
             'time_minutes': 30,
-            'price': Decimal('2.50'),
+            'price': CURRY_PRICE,
             'tags': [{'name': 'Thai'}, {'name': 'Dinner'}],
             'ingredients': [{'name': 'Ingredient'},
                             {'name': 'Not Ingredient'}],
@@ -333,17 +519,16 @@ class PrivateRecipeAPITest(TestCase):
         res = self.client.post(RECIPE_URL, payload, format='json')
 
         self.assertEqual(res.status_code, status.HTTP_201_CREATED)
-        recipes = Recipe.objects.filter(user=self.user)
-        self.assertEqual(recipes.count(), 1)
+        recipes = list(Recipe.objects.filter(user=self.user))
+        self.assertEqual(len(recipes), 1)
         recipe = recipes[0]
         self.assertEqual(recipe.ingredients.count(), 2)
         self.assertIn(ingredient, recipe.ingredients.all())
-        for v in payload['ingredients']:
-            exists = recipe.ingredients.filter(
-                user=self.user,
-                name=v['name'],
-            )
-            self.assertTrue(exists)
+        names = {v['name'] for v in payload['ingredients']}
+        self.assertEqual(
+            recipe.ingredients.filter(user=self.user, name__in=names).count(),
+            len(names),
+        )
 
     def test_create_ingredient_for_recipe_on_update(self):
         """Test creating an ingredient for recipe on update."""
@@ -358,12 +543,11 @@ class PrivateRecipeAPITest(TestCase):
 
         self.assertEqual(res.status_code, status.HTTP_200_OK)
         self.assertEqual(recipe.ingredients.count(), 2)
-        for v in payload['ingredients']:
-            exists = recipe.ingredients.filter(
-                user=self.user,
-                name=v['name'],
-            )
-            self.assertTrue(exists)
+        names = {v['name'] for v in payload['ingredients']}
+        self.assertEqual(
+            recipe.ingredients.filter(user=self.user, name__in=names).count(),
+            len(names),
+        )
 
     def test_update_recipe_assign_ingredient(self):
         """Test updating recipe's assigned ingredients."""
@@ -382,12 +566,11 @@ class PrivateRecipeAPITest(TestCase):
         self.assertEqual(res.status_code, status.HTTP_200_OK)
         self.assertEqual(recipe.ingredients.count(), 2)
 
-        for v in payload['ingredients']:
-            exists = recipe.ingredients.filter(
-                user=self.user,
-                name=v['name'],
-            )
-            self.assertTrue(exists)
+        names = {v['name'] for v in payload['ingredients']}
+        self.assertEqual(
+            recipe.ingredients.filter(user=self.user, name__in=names).count(),
+            len(names),
+        )
 
     def test_clear_recipe_ingredients(self):
         """Test clearing a recipes ingredients."""
@@ -395,7 +578,7 @@ class PrivateRecipeAPITest(TestCase):
                                                 name='Ingredient name')
 
         ingredient2 = Ingredient.objects.create(user=self.user,
-                                                name='Ingredient name')
+                                                name='Ingredient name 2')
         recipe = create_recipe(user=self.user)
         recipe.ingredients.add(ingredient1, ingredient2)
 
@@ -417,7 +600,8 @@ class PrivateRecipeAPITest(TestCase):
         recipe3 = create_recipe(user=self.user, title='recipe 3')
 
         params = {'tags': f'{tag1.id}, {tag2.id}'}
-        res = self.client.get(RECIPE_URL, params)
+        with self.assertNumQueries(3):
+            res = self.client.get(RECIPE_URL, params)
 
         r1 = RecipeSerializer(recipe1)
         r2 = RecipeSerializer(recipe2)
@@ -440,7 +624,8 @@ class PrivateRecipeAPITest(TestCase):
         recipe3 = create_recipe(user=self.user, title='recipe 3')
 
         params = {'ingredients': f'{ingredient1.id}, {ingredient2.id}'}
-        res = self.client.get(RECIPE_URL, params)
+        with self.assertNumQueries(3):
+            res = self.client.get(RECIPE_URL, params)
 
         r1 = RecipeDetailSerializer(recipe1)
         r2 = RecipeDetailSerializer(recipe2)
@@ -453,28 +638,45 @@ class PrivateRecipeAPITest(TestCase):
 
 class TestUploadImage(TestCase):
     """Unit tests for recipe image upload."""
-
-    def setUp(self):
-        self.client = APIClient()
-        self.user = create_user(
+    client_class = APIClient
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.media_root = tempfile.mkdtemp()
+        cls.media_override = override_settings(MEDIA_ROOT=cls.media_root)
+        cls.media_override.enable()
+        image_file = io.BytesIO()
+        Image.new('RGB', (10, 10)).save(image_file, format='JPEG')
+        cls.jpeg_bytes = image_file.getvalue()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.media_override.disable()
+        shutil.rmtree(cls.media_root, ignore_errors=True)
+        super().tearDownClass()
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = create_user(
             email='other@example.com',
             password='password1234',
         )
-        self.client.force_authenticate(self.user)
-        self.recipe = create_recipe(user=self.user)
+        cls.recipe = create_recipe(user=cls.user)
 
-    def tearDown(self):
-        self.recipe.image.delete()
+    def setUp(self):
+        self.client.force_authenticate(self.user)
 
     def test_upload_image_recipe(self):
         """Testing the upload of a recipe image."""
         url = image_upload_url(self.recipe.id)
-        with tempfile.NamedTemporaryFile(suffix='.jpg') as image_file:
-            img = Image.new('RGB', (10, 10))
-            img.save(image_file, format='JPEG')
-            image_file.seek(0)
-            payload = {'image': image_file}
-            res = self.client.post(url, payload, format='multipart')
+        image_file = SimpleUploadedFile(
+            'test.jpg',
+            self.jpeg_bytes,
+            content_type='image/jpeg',
+        )
+        payload = {'image': image_file}
+        res = self.client.post(url, payload, format='multipart')
 
         self.recipe.refresh_from_db()
         self.assertEqual(res.status_code, status.HTTP_200_OK)
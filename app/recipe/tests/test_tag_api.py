@@ -14,12 +14,15 @@ from recipe.serializers import TagSerializer
 
 from .test_ingredient_apis import create_recipe
 
+User = get_user_model()
+
 TAG_URL = reverse('recipe:tag-list')
+TAG_DETAIL_URL = reverse('recipe:tag-detail', args=['_id_'])
 
 
 def create_user(email='email@example.com', password='pass1234'):
     """Create a user instance."""
-    return get_user_model().objects.create_user(
+    return User.objects.create_user(
         email=email,
         password=password,
     )
@@ -27,7 +30,7 @@ def create_user(email='email@example.com', password='pass1234'):
 
 def tag_detail_url(tag_id):
     """Returns the detail url of a specific tag."""
-    return reverse('recipe:tag-detail', args=[tag_id])
+    return TAG_DETAIL_URL.replace('_id_', str(tag_id))
 
 
 def create_tag(user, **params):
@@ -42,9 +45,7 @@ def create_tag(user, **params):
 
 class PublicTagAPITest(TestCase):
     """Test unauthenticated tag APIs."""
-
-    def setUp(self):
-        self.client = APIClient()
+    client_class = APIClient
 
     def test_auth_required_recipe(self):
         """Test auth is required for recipe APIs."""
@@ -55,17 +56,19 @@ class PublicTagAPITest(TestCase):
 
 class PrivateTagAPITest(TestCase):
     """Tes authenticated tag APIs."""
+    client_class = APIClient
 
-    def setUp(self):
-        self.client = APIClient()
-        self.user = create_user()
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = create_user()
 
+    def setUp(self):
         self.client.force_authenticate(self.user)
 
     def test_retrieve_tags(self):
         """Test retrieving a list of tags."""
-        create_tag(user=self.user)
-        create_tag(user=self.user)
+        create_tag(user=self.user, name='tag 1')
+        create_tag(user=self.user, name='tag 2')
 
         res = self.client.get(TAG_URL)
 
@@ -79,12 +82,12 @@ class PrivateTagAPITest(TestCase):
         """Test the retrieval of the users tags."""
         user2 = create_user(email='email2@mail.com', password='pass123QWe')
         create_tag(user=user2)
-        create_tag(user=self.user)
-        create_tag(user=self.user)
+        create_tag(user=self.user, name='tag 1')
+        create_tag(user=self.user, name='tag 2')
 
         res = self.client.get(TAG_URL)
 
-        tags = Tag.objects.filter(user=self.user)
+        tags = Tag.objects.filter(user=self.user).order_by('-name')
         serializer = TagSerializer(tags, many=True)
 
         self.assertEqual(res.status_code, status.HTTP_200_OK)
@@ -105,6 +108,17 @@ class PrivateTagAPITest(TestCase):
         self.assertEqual(tag.name, payload['name'])
         self.assertEqual(tag.user, self.user)
 
+    def test_update_tag_duplicate_name_error(self):
+        """Test renaming a tag to a name the user already uses fails."""
+        create_tag(user=self.user, name='Vegan')
+        tag = create_tag(user=self.user, name='Dessert')
+
+        res = self.client.patch(tag_detail_url(tag.id), {'name': 'Vegan'})
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        tag.refresh_from_db()
+        self.assertEqual(tag.name, 'Dessert')
+
     def test_deleting_tag(self):
         """Test deleting tags."""
         tag = create_tag(user=self.user)
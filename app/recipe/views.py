@@ -1,6 +1,10 @@
 """
 Views for recipe API.
 """
+from collections import defaultdict
+
+from django.core.exceptions import FieldDoesNotExist
+
 from drf_spectacular.utils import (
     extend_schema_view,
     extend_schema,
@@ -16,6 +20,7 @@ from rest_framework.authentication import TokenAuthentication
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.decorators import action
 from rest_framework.response import Response
+from rest_framework.serializers import ListSerializer
 
 
 @extend_schema_view(
@@ -40,6 +45,11 @@ class RecipeViewSet(viewsets.ModelViewSet):
     queryset = Recipe.objects.all()
     authentication_classes = [TokenAuthentication]
     permission_classes = [IsAuthenticated]
+    prefetch_fields = {
+        'retrieve': ['tags', 'ingredients'],
+        'update': ['tags', 'ingredients'],
+        'partial_update': ['tags', 'ingredients'],
+    }
 
     def _params_to_ints(self, params):
         return [int(i) for i in params.split(',')]
@@ -58,8 +68,112 @@ class RecipeViewSet(viewsets.ModelViewSet):
 
         return queryset.filter(
             user=self.request.user,
+            ).prefetch_related(
+                *self.prefetch_fields.get(self.action, []),
             ).order_by('-id').distinct()
 
+    def _is_column(self, model, field):
+        """Tell whether `field` reads a plain, non-relational model column."""
+        if field.source_attrs != [field.source]:
+            return False
+        try:
+            model_field = model._meta.get_field(field.source)
+        except FieldDoesNotExist:
+            return False
+
+        return model_field.concrete and not model_field.is_relation
+
+    def _raw_list_plan(self, fields):
+        """Split list fields into columns and nested M2M relations.
+
+        Return None when some field cannot be read from raw rows, e.g. a
+        method field or a `source='*'`, callable or dotted source.
+        """
+        columns = {}
+        relations = {}
+        for name, field in fields.items():
+            if not isinstance(field, ListSerializer):
+                if not self._is_column(Recipe, field):
+                    return None
+                columns[name] = field
+                continue
+
+            try:
+                m2m = Recipe._meta.get_field(field.source)
+            except FieldDoesNotExist:
+                return None
+            child_fields = field.child.fields
+            if not m2m.many_to_many or not all(
+                self._is_column(m2m.related_model, child)
+                for child in child_fields.values()
+            ):
+                return None
+            relations[name] = (field.source, child_fields)
+
+        return columns, relations
+
+    def _related_by_recipe(self, relation, fields, recipe_ids):
+        """Map recipe ids to the representations of a M2M relation."""
+        related = defaultdict(list)
+        if not recipe_ids:
+            return related
+
+        m2m = Recipe._meta.get_field(relation)
+        target = m2m.m2m_reverse_field_name()
+        rows = m2m.remote_field.through.objects.filter(
+            recipe_id__in=recipe_ids,
+        ).order_by('id').values_list(
+            'recipe_id',
+            *(f'{target}__{field.source}' for field in fields.values()),
+        )
+        for recipe_id, *values in rows:
+            related[recipe_id].append(self._represent(fields, values))
+
+        return related
+
+    def _represent(self, fields, values):
+        """Apply each field's to_representation to a row of raw values."""
+        return {
+            name: None if value is None else field.to_representation(value)
+            for (name, field), value in zip(fields.items(), values)
+        }
+
+    def list(self, request, *args, **kwargs):
+        """List recipes from raw rows, without building model instances."""
+        fields = self.get_serializer().fields
+        plan = self._raw_list_plan(fields)
+        if plan is None:
+            return super().list(request, *args, **kwargs)
+
+        columns, relations = plan
+        queryset = self.filter_queryset(self.get_queryset()).values_list(
+            'id',
+            *(field.source for field in columns.values()),
+        )
+        page = self.paginate_queryset(queryset)
+        rows = list(queryset) if page is None else page
+
+        recipe_ids = [row[0] for row in rows]
+        scalars = [self._represent(columns, row[1:]) for row in rows]
+        related = {
+            name: self._related_by_recipe(source, child_fields, recipe_ids)
+            for name, (source, child_fields) in relations.items()
+        }
+        recipes = [
+            {
+                name: (
+                    related[name][recipe_id] if name in related
+                    else values[name]
+                )
+                for name in fields
+            }
+            for recipe_id, values in zip(recipe_ids, scalars)
+        ]
+
+        if page is not None:
+            return self.get_paginated_response(recipes)
+        return Response(recipes)
+
     def get_serializer_class(self):
         if self.action == 'list':
             return serializers.RecipeSerializer
@@ -84,6 +198,7 @@ class RecipeViewSet(viewsets.ModelViewSet):
 
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
+
 @extend_schema_view(
     list=extend_schema(
         parameters=[
@@ -123,5 +238,5 @@ class TagViewSet(BaseRecipeAttrViewSet):
 
 class IngredientViewSet(BaseRecipeAttrViewSet):
     """Manage ingredients in the database."""
-    serializer_class = serializers.TagSerializer
+    serializer_class = serializers.IngredientSerializer
     queryset = Ingredient.objects.all()
@@ -2,50 +2,66 @@
 Tests for the user api.
 """
 
-from django.test import TestCase
+from django.test import SimpleTestCase, TestCase
 from django.contrib.auth import get_user_model
-from django.urls import reverse
+from django.contrib.auth.hashers import check_password, make_password
+from django.urls import reverse_lazy
 
 from rest_framework.test import APIClient
 from rest_framework import status
 
-CREATE_USER_URL = reverse('user:create')
-TOKEN_URL = reverse('user:token')
-ME_URL = reverse('user:me')
+User = get_user_model()
+
+CREATE_USER_URL = reverse_lazy('user:create')
+TOKEN_URL = reverse_lazy('user:token')
+ME_URL = reverse_lazy('user:me')
+
+DEFAULT_USER = {
+    'email': 'test@example.com',
+    'password': 'testing1234',
+    'name': 'Jhon Doe',
+}
+
+
+def user_payload(**params):
+    """Return the default user payload with `params` overridden."""
+    payload = DEFAULT_USER.copy()
+    payload.update(params)
+
+    return payload
 
 
 def create_user(**params):
     """Create and return a new user."""
-    return get_user_model().objects.create_user(**params)
+    return User.objects.create_user(**params)
 
 
 class PublicUserApiTests(TestCase):
     """Test the public features of the user API."""
-    def setUp(self):
-        self.client = APIClient()
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.token_user = create_user(**user_payload(email='token@example.com'))
 
     def test_create_user_success(self):
         """test creating a user is successful."""
-        payload = {
-            'email': 'test@example.com',
-            'password': 'testing1234',
-            'name': 'Jhon Doe',
-        }
+        payload = user_payload()
         res = self.client.post(CREATE_USER_URL, payload)
 
         self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(res.json(), {
+            'email': payload['email'],
+            'name': payload['name'],
+        })
 
-        user = get_user_model().objects.get(email=payload['email'])
-        self.assertTrue(user.check_password(payload['password']))
-        self.assertNotIn('password', res.data)
+        password = User.objects.values_list('password', flat=True).get(
+            email=payload['email'],
+        )
+        self.assertTrue(check_password(payload['password'], password))
 
     def test_user_with_email_exists_error(self):
         """Test error returned is user with email exists."""
-        payload = {
-            'email': 'test@example.com',
-            'password': 'testing1234',
-            'name': 'Jhon Doe',
-        }
+        payload = user_payload()
         create_user(**payload)
         res = self.client.post(CREATE_USER_URL, payload)
 
@@ -53,65 +69,39 @@ class PublicUserApiTests(TestCase):
 
     def test_password_too_short_error(self):
         """Test error is returned if password is too short."""
-        payload = {
-            'email': 'test@example.com',
-            'password': 'pw',
-            'name': 'test name'
-        }
+        payload = user_payload(password='pw')
         res = self.client.post(CREATE_USER_URL, payload)
 
         self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
-        user_exists = get_user_model().objects.filter(
+        user_exists = User.objects.filter(
             email=payload['email']
         ).exists()
         self.assertFalse(user_exists)
 
     def test_create_token_for_user(self):
         """Test creating a token for user given valid creds."""
-        user_details = {
-            'name': 'Name test',
-            'email': 'email@gmail.com',
-            'password': 'test-pw-user-123',
-        }
-        create_user(**user_details)
-
         payload = {
-            'email': user_details['email'],
-            'password': user_details['password'],
+            'email': self.token_user.email,
+            'password': DEFAULT_USER['password'],
         }
         res = self.client.post(TOKEN_URL, payload)
 
-        self.assertIn('token', res.data)
+        self.assertIn('token', res.json())
         self.assertEqual(res.status_code, status.HTTP_200_OK)
 
     def test_create_token_bad_creds(self):
         """Test returns error if creds are invalid."""
-        user_details = {
-            'name': 'Name test',
-            'email': 'email@gmail.com',
-            'password': 'test-pw-user-123',
-        }
-        create_user(**user_details)
-
         payload = {
-            'email': user_details['email'],
+            'email': self.token_user.email,
             'password': 'somthing',
         }
         res = self.client.post(TOKEN_URL, payload)
-        self.assertNotIn('token', res.data)
+        self.assertNotIn('token', res.json())
         self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
-        user_exists = get_user_model().objects.filter(
-            email=payload['email']
-        ).exists()
-        self.assertTrue(user_exists)
 
     def test_create_token_blank_password(self):
         """Test returns error if password is empty."""
-        user_details = {
-            'name': 'Name test',
-            'email': 'email@gmail.com',
-            'password': '',
-        }
+        user_details = user_payload(password='')
         create_user(**user_details)
 
         payload = {
@@ -119,12 +109,12 @@ class PublicUserApiTests(TestCase):
             'password': 'somthing',
         }
         res = self.client.post(TOKEN_URL, payload)
-        self.assertNotIn('token', res.data)
+        self.assertNotIn('token', res.json())
         self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
-        user_exists = get_user_model().objects.filter(
-            email=payload['email']
-        ).exists()
-        self.assertTrue(user_exists)
+
+
+class PublicUserApiNoDBTests(SimpleTestCase):
+    """Test the public features of the user API that skip the database."""
 
     def test_retrieve_user_unauthorized(self):
         """Test retrieve user is unauthorized."""
@@ -135,19 +125,25 @@ class PublicUserApiTests(TestCase):
 
 class PrivateUserApiTests(TestCase):
     """Test required authentication requests."""
+    client_class = APIClient
+
+    @classmethod
+    def setUpTestData(cls):
+        # None of these tests log in with the initial password, so store
+        # an unusable one rather than running the hasher.
+        cls.user = User.objects.create(
+            email=DEFAULT_USER['email'],
+            name=DEFAULT_USER['name'],
+            password=make_password(None),
+        )
 
     def setUp(self):
-        self.user = create_user(
-            email='test@email.com',
-            password='testpass123',
-            name='Name name',
-        )
-        self.client = APIClient()
         self.client.force_authenticate(user=self.user)
 
     def test_retrieve_profile_success(self):
         """Test retrieving the profile for an authenticated user."""
-        res = self.client.get(ME_URL)
+        with self.assertNumQueries(0):
+            res = self.client.get(ME_URL)
 
         self.assertEqual(res.status_code, status.HTTP_200_OK)
         self.assertEqual(res.data, {
@@ -167,9 +163,14 @@ class PrivateUserApiTests(TestCase):
             'name': 'Updated name',
             'password': 'newpassword123'
         }
-        res = self.client.patch(ME_URL, payload)
+        with self.assertNumQueries(2):
+            res = self.client.patch(ME_URL, payload)
         self.user.refresh_from_db()
 
         self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data, {
+            'name': self.user.name,
+            'email': self.user.email,
+        })
         self.assertEqual(self.user.name, payload['name'])
         self.assertTrue(self.user.check_password(payload['password']))